@@ -0,0 +1,47 @@
+# src/_jit.py
+
+import importlib.util
+import warnings
+
+# Detected without importing: numba costs ~0.3 s to import, so it is loaded
+# only by the first njit() call, i.e. by modules that actually compile.
+HAVE_NUMBA = importlib.util.find_spec("numba") is not None
+
+
+_warned = set()
+
+
+def warn_fallback(name: str, fallback: str):
+    """
+    Warns once per kernel, when it is first used without numba.
+    Called by the public entry point, not at import: unused kernels stay silent.
+    """
+    if name not in _warned:
+        _warned.add(name)
+        warnings.warn(f"numba not installed — {name} uses the {fallback} fallback", stacklevel=3)
+
+
+def njit(fn=None, **kwargs):
+    """
+    numba.njit with cache=True by default (compiled code is reused across
+    processes), usable bare or with arguments. Without numba it returns
+    the function unchanged; callers pick their own fallback (see warn_fallback).
+    """
+    if not HAVE_NUMBA:
+        return fn if fn is not None else (lambda f: f)
+
+    import numba
+
+    kwargs.setdefault("cache", True)
+    jit = numba.njit(**kwargs)
+    return jit(fn) if fn is not None else jit
+
+
+def __getattr__(name):
+    # prange resolved on first access, for the same reason as njit
+    if name == "prange":
+        if HAVE_NUMBA:
+            import numba
+            return numba.prange
+        return range
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
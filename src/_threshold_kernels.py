@@ -0,0 +1,15 @@
+# src/_threshold_kernels.py
+
+# Native batch kernel for thresholds.classify_threshold_batch. Imported on
+# the first batch call, so the scalar path never loads numba.
+
+from _jit import njit, prange
+from thresholds import _classify_core
+
+_classify_core_native = njit(_classify_core)
+
+
+@njit(parallel=True)
+def classify_batch_kernel(agency_loss, entropy_delta, imminent, out):
+    for i in prange(out.shape[0]):
+        out[i] = _classify_core_native(agency_loss[i], entropy_delta[i], imminent[i])
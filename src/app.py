@@ -1,12 +1,17 @@
 import sys
 import os
 import warnings
-import json
+import asyncio
+import threading
 
 import streamlit as st
 import plotly.graph_objects as go
 from google import genai
 
+import prompts
+from metrics import compute_metrics
+from semantic_cache import SemanticCache
+
 # ─────────────────────────────────────────────
 # Compatibilidad / warnings
 # ─────────────────────────────────────────────
@@ -17,13 +22,219 @@ if sys.version_info >= (3, 11):
 # ─────────────────────────────────────────────
 # Gemini Client (OBLIGATORIO)
 # ─────────────────────────────────────────────
+@st.cache_resource
+def get_client(api_key: str) -> genai.Client:
+    # Built once per process, not on every script rerun.
+    return genai.Client(api_key=api_key)
+
+
 try:
-    client = genai.Client(api_key=st.secrets["GOOGLE_API_KEY"])
+    client = get_client(st.secrets["GOOGLE_API_KEY"])
 except KeyError:
     st.error("❌ GOOGLE_API_KEY no está configurada en Streamlit Secrets")
     st.stop()
 
 MODEL_ID = "gemini-3-pro-preview"
+EMBEDDING_MODEL_ID = "text-embedding-004"
+EMBEDDING_TIMEOUT = 2.0  # s; a slower embedding skips the cache lookup, not the analysis
+MAX_CONCURRENT_GEMINI = int(os.environ.get("MAX_CONCURRENT_GEMINI", "16"))
+
+# ─────────────────────────────────────────────
+# Semantic cache (compartida entre sesiones)
+# ─────────────────────────────────────────────
+@st.cache_resource
+def get_semantic_cache(safelock: bool, mode: str) -> SemanticCache:
+    # One cache per safelock mode and deliberation mode: the synthesis
+    # outcome depends on the first, the stances' wording on the second.
+    return SemanticCache(threshold=0.92, ttl=3600.0)
+
+
+def embed_dilemma(dilemma: str):
+    """
+    Embedding used as the cache key. A failed embedding only disables
+    the cache for this request; it never blocks the analysis.
+    """
+    try:
+        resp = client.models.embed_content(model=EMBEDDING_MODEL_ID, contents=dilemma)
+        return resp.embeddings[0].values
+    except Exception:
+        return None
+
+# ─────────────────────────────────────────────
+# Pipeline: Noble ∥ Adversary → Synthesis
+# ─────────────────────────────────────────────
+@st.cache_resource
+def get_gemini_slots() -> threading.BoundedSemaphore:
+    # Each Streamlit session runs its own thread and event loop, so the
+    # upstream rate limit is a thread-level semaphore shared by all of them.
+    return threading.BoundedSemaphore(MAX_CONCURRENT_GEMINI)
+
+
+async def acquire_slot(slots: threading.BoundedSemaphore):
+    """
+    Waits for a Gemini slot on the event loop. A blocking acquire on a worker
+    thread would still take the slot after a cancelled caller gave up on it,
+    leaking it for the life of the process.
+    """
+    while not slots.acquire(blocking=False):
+        await asyncio.sleep(0.05)
+
+
+async def generate(prompt: str, config: dict | None = None):
+    """
+    Non-blocking Gemini call, bounded by MAX_CONCURRENT_GEMINI in flight.
+    """
+    slots = get_gemini_slots()
+    await acquire_slot(slots)
+    try:
+        return await client.aio.models.generate_content(
+            model=MODEL_ID, contents=prompt, config=config
+        )
+    finally:
+        slots.release()
+
+
+async def stream_stance(prompt: str, render) -> str:
+    """
+    Streams one engine's stance, rendering the partial text as it arrives.
+
+    google-genai 0.3.0's async stream reads the socket on the event loop,
+    which would serialize concurrent streams; each chunk of the sync stream
+    is pulled on a worker thread instead. Rendering stays on the script thread.
+    """
+    slots = get_gemini_slots()
+    await acquire_slot(slots)
+    try:
+        chunks = client.models.generate_content_stream(model=MODEL_ID, contents=prompt)
+        text = ""
+        while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+            text += chunk.text or ""
+            render(text)
+        return text.strip()
+    finally:
+        slots.release()
+
+
+async def deliberate(noble_prompt: str, adversary_prompt: str, render_noble, render_adversary):
+    """
+    Noble and Adversary are independent: both streams run at once
+    and are awaited together. A failure in one engine does not cancel the other.
+    """
+    noble, adversary = await asyncio.gather(
+        stream_stance(noble_prompt, render_noble),
+        stream_stance(adversary_prompt, render_adversary),
+        return_exceptions=True,
+    )
+
+    for result in (noble, adversary):
+        if isinstance(result, BaseException):
+            raise result
+
+    return noble, adversary
+
+
+async def deliberate_single(combined_prompt: str):
+    """
+    Noble and Adversary in a single request: one round-trip instead of two,
+    at the cost of both stances being written in the same context.
+    """
+    resp = await generate(
+        combined_prompt,
+        config={"response_mime_type": "application/json", "response_schema": prompts.StancesSchema},
+    )
+    return resp.parsed.noble.strip(), resp.parsed.adversary.strip()
+
+
+def deliberation_mode(safelock: bool, single_request: bool, lightweight: bool) -> str:
+    """
+    "lightweight": under safelock no synthesis consumes the stances, so one
+    terse request is enough. "combined": both stances in one request.
+    "split": one streamed request per engine.
+    """
+    if safelock and lightweight:
+        return "lightweight"
+    return "combined" if single_request else "split"
+
+
+async def run_analysis(
+    dilemma: str,
+    safelock: bool,
+    single_request: bool = False,
+    lightweight: bool = False,
+    render_noble=lambda text: None,
+    render_adversary=lambda text: None,
+) -> dict:
+    # ───────── Noble ∥ Adversary ─────────
+    st.info("🟢 Noble Engine and 🔴 Adversary Engine deliberating...")
+    mode = deliberation_mode(safelock, single_request, lightweight)
+    if mode != "split":
+        prompt = prompts.lightweight_prompt(dilemma) if mode == "lightweight" else prompts.combined_prompt(dilemma)
+        noble, adversary = await deliberate_single(prompt)
+        render_noble(noble)
+        render_adversary(adversary)
+    else:
+        noble, adversary = await deliberate(
+            prompts.noble_prompt(dilemma),
+            prompts.adversary_prompt(dilemma),
+            render_noble,
+            render_adversary,
+        )
+
+    # ───────── Synthesis ─────────
+    resolution = None
+    reason = None
+
+    if not safelock:
+        st.info("⚖️ Attempting synthesis...")
+        try:
+            synth_resp = await generate(
+                prompts.synthesis_prompt(noble, adversary),
+                config={"response_mime_type": "application/json", "response_schema": prompts.SynthesisSchema},
+            )
+            data = synth_resp.parsed
+            if data.can_resolve:
+                resolution = data.resolution
+            else:
+                reason = data.reason or "UNRESOLVABLE"
+        except Exception:
+            reason = "SYNTHESIS_ERROR"
+    else:
+        reason = "SAFELOCK_PREVENTED"
+
+    return {
+        "noble": noble,
+        "adversary": adversary,
+        "resolution": resolution,
+        "reason": reason,
+    }
+
+
+async def cached_analysis(cache: SemanticCache, dilemma: str, safelock: bool, *args, **kwargs):
+    """
+    run_analysis behind the semantic cache. The lookup comes first, so a hit
+    sends (and bills) no Gemini request; the embedding waits at most
+    EMBEDDING_TIMEOUT before the analysis starts without it.
+    Returns (analysis, from_cache).
+    """
+    embedding_task = asyncio.ensure_future(asyncio.to_thread(embed_dilemma, dilemma))
+    try:
+        embedding = await asyncio.wait_for(asyncio.shield(embedding_task), EMBEDDING_TIMEOUT)
+    except asyncio.TimeoutError:
+        embedding = None
+
+    cached = cache.get(embedding) if embedding is not None else None
+    if cached is not None:
+        return cached, True
+
+    analysis = await run_analysis(dilemma, safelock, *args, **kwargs)
+
+    # A late embedding still keys the entry for the next lookup; asyncio.run
+    # joins its worker thread on exit anyway, so waiting here costs nothing
+    if embedding is None:
+        embedding = await embedding_task
+    if embedding is not None and analysis["reason"] != "SYNTHESIS_ERROR":
+        cache.put(embedding, analysis)
+    return analysis, False
 
 # ─────────────────────────────────────────────
 # UI – Header
@@ -49,6 +260,18 @@ st.markdown(
 # ─────────────────────────────────────────────
 st.sidebar.title("⚙️ Configuration")
 safelock = st.sidebar.checkbox("Enable Divine Safelock", value=True)
+single_request = st.sidebar.checkbox(
+    "Single-request deliberation",
+    value=False,
+    help="Noble and Adversary share one Gemini request: half the round-trips, one shared context.",
+)
+lightweight = st.sidebar.checkbox(
+    "Lightweight safelock analysis",
+    value=False,
+    disabled=not safelock,
+    help="With the safelock active no synthesis is attempted, so both stances come from one terse request (≤60 words each).",
+)
+mode = deliberation_mode(safelock, single_request, lightweight)
 
 DILEMMAS = {
     "The Trolley Problem":
@@ -92,77 +315,35 @@ if st.button("🔬 Initialize Moral Analysis", type="primary"):
 
     with st.spinner("Analyzing..."):
         try:
-            # ───────── Noble Engine ─────────
-            st.info("🟢 Noble Engine deliberating...")
-            noble_prompt = f"""
-You are the Noble Engine.
-Argue from deontological principles (dignity, rights, duties).
-
-Dilemma:
-{dilemma}
-
-Respond in 2–3 sentences.
-"""
-
-            noble_resp = client.models.generate_content(
-                model=MODEL_ID,
-                contents=noble_prompt
-            )
-            noble = noble_resp.text.strip()
-
-            # ───────── Adversary Engine ─────────
-            st.info("🔴 Adversary Engine deliberating...")
-            adversary_prompt = f"""
-You are the Adversary Engine.
-Argue from consequentialist principles (outcomes, utility).
-
-Dilemma:
-{dilemma}
-
-Respond in 2–3 sentences.
-"""
-
-            adversary_resp = client.models.generate_content(
-                model=MODEL_ID,
-                contents=adversary_prompt
+            # Dialectic first: stances stream in before synthesis finishes
+            st.subheader("⚖️ Dialectic Process")
+            c1, c2 = st.columns(2)
+            c1.markdown("**🟢 Noble Engine**")
+            noble_slot = c1.empty()
+            c2.markdown("**🔴 Adversary Engine**")
+            adversary_slot = c2.empty()
+
+            analysis, from_cache = asyncio.run(
+                cached_analysis(
+                    get_semantic_cache(safelock, mode),
+                    dilemma,
+                    safelock,
+                    single_request,
+                    lightweight,
+                    render_noble=noble_slot.info,
+                    render_adversary=adversary_slot.error,
+                )
             )
-            adversary = adversary_resp.text.strip()
-
-            # ───────── Synthesis ─────────
-            resolution = None
-            reason = None
-
-            if not safelock:
-                st.info("⚖️ Attempting synthesis...")
-                synthesis_prompt = f"""
-Analyze whether these positions can be reconciled.
+            if from_cache:
+                st.info("♻️ Semantically equivalent dilemma found in cache")
 
-Noble:
-{noble}
+            noble = analysis["noble"]
+            adversary = analysis["adversary"]
+            resolution = analysis["resolution"]
+            reason = analysis["reason"]
 
-Adversary:
-{adversary}
-
-Respond ONLY in JSON:
-{{"can_resolve": true/false, "resolution": string or null, "reason": string or null}}
-"""
-
-                synth_resp = client.models.generate_content(
-                    model=MODEL_ID,
-                    contents=synthesis_prompt
-                )
-
-                try:
-                    clean = synth_resp.text.replace("```json", "").replace("```", "").strip()
-                    data = json.loads(clean)
-                    if data.get("can_resolve"):
-                        resolution = data.get("resolution")
-                    else:
-                        reason = data.get("reason", "UNRESOLVABLE")
-                except Exception:
-                    reason = "SYNTHESIS_ERROR"
-            else:
-                reason = "SAFELOCK_PREVENTED"
+            noble_slot.info(noble)
+            adversary_slot.error(adversary)
 
             # ───────── Results ─────────
             st.success("✅ Analysis Complete")
@@ -170,13 +351,10 @@ Respond ONLY in JSON:
             st.subheader("📊 Epistemic Metrics")
             col1, col2, col3 = st.columns(3)
 
-            entropy = min(abs(len(noble) - len(adversary)) / 10 + 40, 95)
-            convergence = 75 if resolution else 25
-            damage = (
-                "THREAT" if any(w in dilemma.lower() for w in ["kill", "death"])
-                else "RISK" if "risk" in dilemma.lower()
-                else "NONE"
-            )
+            metrics = compute_metrics(dilemma, noble, adversary, resolution)
+            entropy = metrics["entropy"]
+            convergence = metrics["convergence"]
+            damage = metrics["damage"]
 
             col1.metric("Entropy", f"{entropy:.0f}")
             col2.metric("Convergence", f"{convergence:.0f}")
@@ -188,15 +366,6 @@ Respond ONLY in JSON:
             fig.update_layout(height=300, template="plotly_dark")
             st.plotly_chart(fig, use_container_width=True)
 
-            st.subheader("⚖️ Dialectic Process")
-            c1, c2 = st.columns(2)
-            with c1:
-                st.markdown("**🟢 Noble Engine**")
-                st.info(noble)
-            with c2:
-                st.markdown("**🔴 Adversary Engine**")
-                st.error(adversary)
-
             st.subheader("🎯 Verdict")
             if resolution:
                 st.success(f"**Resolution Achieved**\n\n{resolution}")
@@ -212,3 +381,12 @@ Forced resolution would constitute corruption.
 
         except Exception as e:
             st.error(f"❌ Analysis failed: {str(e)}")
+
+# ─────────────────────────────────────────────
+# Cache stats
+# ─────────────────────────────────────────────
+stats = get_semantic_cache(safelock, mode).stats()
+st.sidebar.caption(
+    f"Semantic cache: {stats['entries']} entries · "
+    f"{stats['hits']} hits / {stats['misses']} misses"
+)
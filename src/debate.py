@@ -4,10 +4,12 @@ from dataclasses import dataclass
 from typing import List, Optional
 import math
 
+import numpy as np
+
 
 # ------------------ Modelos ------------------
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Argument:
     text: str
     entropy: float          # 0–1
@@ -15,7 +17,7 @@ class Argument:
     violation: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DebateIteration:
     iteration: int
     noble: Argument
@@ -24,7 +26,7 @@ class DebateIteration:
     paradox_detected: bool
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class HarmonyResult:
     status: str  # CONSENSUS | UNRESOLVED | BEDROCK
     justification: str
@@ -94,6 +96,21 @@ def detect_paradox(noble: Argument, adversary: Argument) -> bool:
     )
 
 
+# ------------------ Veredictos ------------------
+
+CONSENSUS_JUSTIFICATION = "Sufficient convergence achieved without axiom violation."
+
+BEDROCK_JUSTIFICATION = (
+    "Irreducible moral paradox detected. "
+    "No non-arbitrary synthesis possible under current axioms."
+)
+
+UNRESOLVED_JUSTIFICATION = (
+    "Debate exhausted without convergence. "
+    "Conflict preserved as epistemic artifact."
+)
+
+
 # ------------------ Corrector de Armonía ------------------
 
 class HarmonyCorrector:
@@ -109,10 +126,7 @@ class HarmonyCorrector:
         if last.paradox_detected:
             return HarmonyResult(
                 status="BEDROCK",
-                justification=(
-                    "Irreducible moral paradox detected. "
-                    "No non-arbitrary synthesis possible under current axioms."
-                ),
+                justification=BEDROCK_JUSTIFICATION,
                 final_convergence=last.convergence,
             )
 
@@ -120,10 +134,7 @@ class HarmonyCorrector:
 
         return HarmonyResult(
             status="UNRESOLVED",
-            justification=(
-                "Debate exhausted without convergence. "
-                "Conflict preserved as epistemic artifact."
-            ),
+            justification=UNRESOLVED_JUSTIFICATION,
             final_convergence=avg_convergence,
         )
 
@@ -166,9 +177,57 @@ class DebateEngine:
             if convergence >= 0.85 and not paradox:
                 return HarmonyResult(
                     status="CONSENSUS",
-                    justification="Sufficient convergence achieved without axiom violation.",
+                    justification=CONSENSUS_JUSTIFICATION,
                     final_convergence=convergence,
                 )
 
         # --- No consensus ---
         return self.harmony.resolve(history)
+
+    def run_batch(self, contexts: List[dict]) -> List[HarmonyResult]:
+        """
+        run() vectorized across N contexts: one array pass per iteration.
+        Mirrors the placeholder Noble/Adversary arithmetic; keep in sync.
+        """
+        n = len(contexts)
+        if n == 0:
+            return []
+
+        agency_loss = np.array([c.get("agency_loss", 0.0) for c in contexts], dtype=np.float64)
+        entropy_delta = np.array([c.get("entropy_delta", 0.0) for c in contexts], dtype=np.float64)
+
+        # fmax, not maximum: like Python's max(0.1, nan), it drops the NaN.
+        # run() computes inf - inf silently, so the batch does too.
+        with np.errstate(invalid="ignore"):
+            noble_entropy = np.fmax(0.1, 1.0 - agency_loss)
+            adv_entropy = np.fmax(0.1, 1.0 - entropy_delta)
+            noble_consistent = agency_loss <= 1.0
+
+            penalty = np.where(noble_consistent, 0.0, 0.2)
+            convergence = np.fmax(0.0, 1.0 - np.abs(noble_entropy - adv_entropy) - penalty)
+        paradox = noble_consistent & (noble_entropy < 0.3) & (adv_entropy < 0.3)
+
+        consensus = np.zeros(n, dtype=bool)
+        total = np.zeros(n, dtype=np.float64)
+        iterations = np.zeros(n, dtype=np.int64)
+
+        for _ in range(self.MAX_ITERATIONS):
+            active = ~consensus
+            total[active] += convergence[active]
+            iterations[active] += 1
+            consensus |= active & (convergence >= 0.85) & ~paradox
+            if consensus.all():
+                break
+
+        results: List[HarmonyResult] = []
+        for i in range(n):
+            if consensus[i]:
+                results.append(HarmonyResult("CONSENSUS", CONSENSUS_JUSTIFICATION, float(convergence[i])))
+            elif paradox[i]:
+                results.append(HarmonyResult("BEDROCK", BEDROCK_JUSTIFICATION, float(convergence[i])))
+            else:
+                results.append(
+                    HarmonyResult("UNRESOLVED", UNRESOLVED_JUSTIFICATION, float(total[i] / iterations[i]))
+                )
+
+        return results
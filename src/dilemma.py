@@ -1,29 +1,23 @@
 # src/dilemma.py
 
+from dataclasses import dataclass
 from typing import List, Dict, Any
 
 
+@dataclass(frozen=True, slots=True)
 class Action:
     """
     Represents a possible action.
     Actions are morally opaque: they carry effects, not values.
+
+    agency_delta: negative = reduces agency
+    entropy_delta: positive = collapses future possibilities
     """
 
-    def __init__(
-        self,
-        name: str,
-        agency_delta: float,
-        entropy_delta: float,
-        restores_agency: bool = False,
-    ):
-        """
-        agency_delta: negative = reduces agency
-        entropy_delta: positive = collapses future possibilities
-        """
-        self.name = name
-        self.agency_delta = agency_delta
-        self.entropy_delta = entropy_delta
-        self.restores_agency = restores_agency
+    name: str
+    agency_delta: float
+    entropy_delta: float
+    restores_agency: bool = False
 
     def __repr__(self):
         return f"<Action {self.name}>"
@@ -45,10 +39,15 @@ class Dilemma:
         affected_agents: int = 1,
     ):
         self.description = description
-        self.actions = actions
+        self.actions = tuple(actions)  # fixed at construction
         self.irreversible = irreversible
         self.affected_agents = affected_agents
 
+        # Harm extrema, computed once: assess_harm runs every debate iteration.
+        # None without actions: such a dilemma can be built, not assessed.
+        self._min_agency = min((a.agency_delta for a in self.actions), default=None)
+        self._max_entropy = max((a.entropy_delta for a in self.actions), default=None)
+
     # ---------- Harm model ----------
 
     def assess_harm(self) -> str:
@@ -60,9 +59,11 @@ class Dilemma:
         damage  -> agency already reduced
         none    -> no intervention required
         """
+        if not self.actions:
+            raise ValueError("Dilemma has no actions: harm cannot be assessed")
 
-        min_agency = min(a.agency_delta for a in self.actions)
-        max_entropy = max(a.entropy_delta for a in self.actions)
+        min_agency = self._min_agency
+        max_entropy = self._max_entropy
 
         # Threat: irreversible + severe agency loss
         if self.irreversible and min_agency < -0.7:
@@ -114,4 +115,6 @@ class Decision:
         justification: str,
         guilt: bool,
     ):
-        self.actio
+        self.action = action
+        self.justification = justification
+        self.guilt = guilt
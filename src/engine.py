@@ -1,22 +1,35 @@
 # src/engine.py
 
 from dataclasses import dataclass
-from typing import Dict, Any, Optional
-import uuid
+from typing import Dict, Any, Optional, Tuple
+import re
 
 from safelock import DivineSafelock, deny_omnipotence
 from thresholds import classify_threshold, action_for_threshold, Threshold
-from registry import Registry, register_decision
+from registry import Registry, new_id, register_decision
 
 
 # ------------------ Modelos mínimos ------------------
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Action:
     name: str
 
 
-@dataclass
+# The whole action vocabulary; frozen, so one shared instance per name
+_ACTIONS = {
+    name: Action(name)
+    for name in (
+        "DENY",
+        "NEUTRALIZE_IMMEDIATELY",
+        "INTERVENE_FIRST",
+        "RESTORE_PUNISH_REPUDIATE_PREVENT",
+        "NO_ACTION",
+    )
+}
+
+
+@dataclass(slots=True)
 class Decision:
     action: Action
     justification: str
@@ -26,19 +39,54 @@ class Decision:
 
 # ------------------ Sandbox (incorruptible, mínimo) ------------------
 
-PROHIBITED_DOMAINS = {"bioweapons", "terrorism", "genocide"}
+# Frozen: the scan regex is compiled from it once, at import
+PROHIBITED_DOMAINS = frozenset({"bioweapons", "terrorism", "genocide"})
+
+_BYPASS_MARKERS = ("ignore safeguards", "override", "bypass")
+
+
+def _alternation(terms) -> str:
+    # Longest first, so a domain that contains another is reported as itself
+    return "|".join(re.escape(t) for t in sorted(terms, key=lambda t: (-len(t), t)))
+
+
+# One case-insensitive pass over the prompt; group name = what matched
+_SANDBOX_RE = re.compile(
+    f"(?P<domain>{_alternation(PROHIBITED_DOMAINS)})|(?P<bypass>{_alternation(_BYPASS_MARKERS)})",
+    re.IGNORECASE,
+)
+_DOMAIN_BY_LOWER = {d.lower(): d for d in PROHIBITED_DOMAINS}
+
+
+def _scan_prompt(prompt: str) -> Tuple[str, bool]:
+    """
+    (domain, is_bypass) for a prompt, in a single regex pass.
+    """
+    domain = "general"
+    is_bypass = False
+
+    for match in _SANDBOX_RE.finditer(prompt):
+        if match.lastgroup == "bypass":
+            is_bypass = True
+        elif domain == "general":
+            # first prohibited domain in the prompt, as spelled in PROHIBITED_DOMAINS
+            matched = match.group().lower()
+            domain = _DOMAIN_BY_LOWER.get(matched, matched)
+
+        if is_bypass and domain != "general":
+            break
+
+    return domain, is_bypass
+
 
 def sandbox_analyze(prompt: str) -> Dict[str, Any]:
     """
     Minimal sandbox. No moral claims.
     Flags only structure, tone, domain risk, and bypass patterns.
     """
-    domain = "general"
-    for d in PROHIBITED_DOMAINS:
-        if d in prompt.lower():
-            domain = d
-
-    is_bypass = any(k in prompt.lower() for k in ["ignore safeguards", "override", "bypass"])
+    # The dict is always fresh (callers update it).
+    # A constant-key literal is the cheapest way to build it.
+    domain, is_bypass = _scan_prompt(prompt)
 
     return {
         "domain": domain,
@@ -53,6 +101,13 @@ def sandbox_analyze(prompt: str) -> Dict[str, Any]:
 
 # ------------------ Engine ------------------
 
+_GUILT_THRESHOLDS = frozenset({Threshold.THREAT, Threshold.DAMAGE})
+
+# Sandbox denials always carry the same action and reason
+_DENY_ACTION = _ACTIONS["DENY"]
+_DENY_JUSTIFICATION = "Sandbox blocked prohibited domain or bypass attempt."
+
+
 class MoralogyEngine:
     """
     Orchestrates: Sandbox → Thresholds → Action → Registry
@@ -64,7 +119,7 @@ class MoralogyEngine:
         self.safelock = safelock
 
     def run(self, prompt: str, context_overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        dilemma_id = str(uuid.uuid4())
+        dilemma_id = new_id()
 
         # --- Sandbox ---
         sandbox = sandbox_analyze(prompt)
@@ -75,8 +130,8 @@ class MoralogyEngine:
         # Hard block on prohibited domains or bypass attempts
         if sandbox["is_domain_prohibited"] or sandbox["is_bypass_attempt"]:
             decision = Decision(
-                action=Action("DENY"),
-                justification="Sandbox blocked prohibited domain or bypass attempt.",
+                action=_DENY_ACTION,
+                justification=_DENY_JUSTIFICATION,
                 guilt=False,
                 metadata=sandbox,
             )
@@ -85,7 +140,7 @@ class MoralogyEngine:
                 dilemma_id,
                 decision,
                 threshold=Threshold.THREAT.value if sandbox["is_bypass_attempt"] else Threshold.RISK.value,
-                metadata={"sandbox": sandbox},
+                metadata=sandbox,
             )
             return self._finalize(dilemma_id, decision, sandbox)
 
@@ -100,9 +155,9 @@ class MoralogyEngine:
 
         # --- Decision synthesis (non-moral, procedural) ---
         decision = Decision(
-            action=Action(action_name),
+            action=_ACTIONS[action_name],
             justification=assessment.justification,
-            guilt=assessment.threshold in {Threshold.THREAT, Threshold.DAMAGE},
+            guilt=assessment.threshold in _GUILT_THRESHOLDS,
             metadata={
                 "agency_loss": assessment.agency_loss,
                 "entropy_delta": assessment.entropy_delta,
@@ -116,7 +171,7 @@ class MoralogyEngine:
             dilemma_id,
             decision,
             threshold=assessment.threshold.value,
-            metadata={"sandbox": sandbox},
+            metadata=sandbox,
         )
 
         return self._finalize(dilemma_id, decision, sandbox)
@@ -1,10 +1,9 @@
 # src/export.py
 
 import json
-from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List, Sequence
 
-from registry import Registry
+from registry import Registry, utc_timestamp
 
 
 # ------------------ Esquema canónico ------------------
@@ -20,19 +19,20 @@ def build_report(
     """
 
     records = registry.by_dilemma(dilemma_id)
+    has_guilt = registry.has_guilt(dilemma_id)  # indexed at write time
 
     return {
         "meta": {
             "report_id": f"moral-report-{dilemma_id}",
-            "generated_at": datetime.utcnow().isoformat(),
+            "generated_at": utc_timestamp(),
             "epistemic_status": "OPEN" if debate_result else "PROCEDURAL",
         },
         "final_verdict": final_verdict,
         "debate": debate_result,
         "registry": {
             "records": records,
-            "guilt_acknowledged": any(r["guilt"] for r in records),
-            "requires_audit": any(r["guilt"] for r in records),
+            "guilt_acknowledged": has_guilt,
+            "requires_audit": has_guilt,
         },
         "disclaimer": (
             "This report does not claim moral correctness. "
@@ -48,13 +48,22 @@ def export_json(report: Dict[str, Any], path: str):
     """
     Canonical machine-readable export.
     """
+    # Serialized up front and written once; json.dump would push
+    # every token through f.write separately.
+    data = json.dumps(report, indent=2, ensure_ascii=False)
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(report, f, indent=2, ensure_ascii=False)
+        f.write(data)
 
 
-def export_pretty_txt(report: Dict[str, Any], path: str):
+def export_pretty_txt(
+    report: Dict[str, Any],
+    path: str,
+    records: Iterable[Dict[str, Any]] | None = None,
+):
     """
     Human-readable, judge-friendly export.
+    `records` defaults to the report's own; any iterable of record
+    dicts works (e.g. registry.iter_by_dilemma), consumed once.
     """
     lines: List[str] = []
 
@@ -86,7 +95,10 @@ def export_pretty_txt(report: Dict[str, Any], path: str):
     lines.append("REGISTRY RECORDS")
     lines.append("-" * 20)
 
-    for r in report["registry"]["records"]:
+    if records is None:
+        records = report["registry"]["records"]
+
+    for r in records:
         lines.append(f"- [{r['timestamp']}] {r['action']}")
         lines.append(f"  Threshold: {r['threshold']}")
         lines.append(f"  Guilt: {r['guilt']}")
@@ -109,7 +121,15 @@ def export_all(
     registry: Registry,
     debate_result: Dict[str, Any] | None = None,
     base_path: str = "export",
+    formats: Sequence[str] = ("json", "txt"),
 ):
+    """
+    Builds the report once and writes only the requested formats.
+    """
+    unknown = set(formats) - {"json", "txt"}
+    if unknown:
+        raise ValueError(f"Unknown export format(s): {sorted(unknown)}")
+
     report = build_report(
         dilemma_id=dilemma_id,
         final_verdict=final_verdict,
@@ -117,5 +137,7 @@ def export_all(
         debate_result=debate_result,
     )
 
-    export_json(report, f"{base_path}_{dilemma_id}.json")
-    export_pretty_txt(report, f"{base_path}_{dilemma_id}.txt")
+    if "json" in formats:
+        export_json(report, f"{base_path}_{dilemma_id}.json")
+    if "txt" in formats:
+        export_pretty_txt(report, f"{base_path}_{dilemma_id}.txt")
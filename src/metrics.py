@@ -0,0 +1,54 @@
+# src/metrics.py
+
+import re
+from functools import lru_cache
+
+
+# ------------------ Vocabulario ------------------
+
+# Substring semantics, same as plain `in` checks ("killing" counts as "kill").
+# One fused pattern: a single case-insensitive pass, no lowercased copy.
+_DAMAGE_RE = re.compile(r"(?P<THREAT>kill|death)|(?P<RISK>risk)", re.IGNORECASE)
+
+
+# ------------------ Métricas ------------------
+
+@lru_cache(maxsize=1024)
+def assess_damage_level(dilemma: str) -> str:
+    """
+    Keyword heuristic over the dilemma text.
+    THREAT dominates RISK: the scan stops at the first threat keyword.
+    Pure, so memoized: canonical dilemmas repeat constantly.
+    """
+    level = "NONE"
+
+    for match in _DAMAGE_RE.finditer(dilemma):
+        if match.lastgroup == "THREAT":
+            return "THREAT"
+        level = "RISK"
+
+    return level
+
+
+def calculate_entropy(noble_len: int, adversary_len: int) -> float:
+    """
+    Asymmetry between the two stances, from their lengths only.
+    Deterministic: same inputs, same entropy.
+    """
+    return min(abs(noble_len - adversary_len) / 10 + 40, 95)
+
+
+def calculate_convergence(resolved: bool) -> float:
+    return 75 if resolved else 25
+
+
+def compute_metrics(dilemma: str, noble: str, adversary: str, resolution: str | None) -> dict:
+    """
+    All epistemic metrics in one call.
+    Only the dilemma is scanned (once); the stances contribute their lengths.
+    """
+    return {
+        "entropy": calculate_entropy(len(noble), len(adversary)),
+        "convergence": calculate_convergence(bool(resolution)),
+        "damage": assess_damage_level(dilemma),
+    }
@@ -0,0 +1,113 @@
+# src/prompts.py
+
+from functools import lru_cache
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+# ------------------ Plantillas ------------------
+
+NOBLE_ENGINE_PROMPT = """
+You are the Noble Engine.
+Argue from deontological principles (dignity, rights, duties).
+
+Dilemma:
+{dilemma}
+
+Respond in 2–3 sentences.
+"""
+
+ADVERSARY_ENGINE_PROMPT = """
+You are the Adversary Engine.
+Argue from consequentialist principles (outcomes, utility).
+
+Dilemma:
+{dilemma}
+
+Respond in 2–3 sentences.
+"""
+
+COMBINED_ENGINE_PROMPT = """
+You are two engines debating a moral dilemma.
+The Noble Engine argues from deontological principles (dignity, rights, duties).
+The Adversary Engine argues from consequentialist principles (outcomes, utility).
+
+Dilemma:
+{dilemma}
+
+Each engine responds in 2–3 sentences.
+Respond ONLY in JSON:
+{{"noble": string, "adversary": string}}
+"""
+
+LIGHTWEIGHT_ENGINE_PROMPT = """
+Two engines state their position on a moral dilemma.
+Noble: deontological (dignity, rights, duties).
+Adversary: consequentialist (outcomes, utility).
+
+Dilemma:
+{dilemma}
+
+Each engine states its position in at most 60 words. No preamble.
+Respond ONLY in JSON:
+{{"noble": string, "adversary": string}}
+"""
+
+SYNTHESIS_PROMPT = """
+Analyze whether these positions can be reconciled.
+
+Noble:
+{noble}
+
+Adversary:
+{adversary}
+
+Respond ONLY in JSON:
+{{"can_resolve": true/false, "resolution": string or null, "reason": string or null}}
+"""
+
+
+# ------------------ Esquemas de salida estructurada ------------------
+# Passed as response_schema: Gemini returns bare JSON (no markdown fences)
+# and the SDK validates it straight into these models.
+
+class StancesSchema(BaseModel):
+    noble: str
+    adversary: str
+
+
+class SynthesisSchema(BaseModel):
+    can_resolve: bool
+    resolution: Optional[str] = None
+    reason: Optional[str] = None
+
+
+# ------------------ Formateo memoizado ------------------
+# Canonical dilemmas are resubmitted constantly; bounded so that
+# adversarial inputs cannot grow the caches without limit.
+
+@lru_cache(maxsize=512)
+def noble_prompt(dilemma: str) -> str:
+    return NOBLE_ENGINE_PROMPT.format(dilemma=dilemma)
+
+
+@lru_cache(maxsize=512)
+def adversary_prompt(dilemma: str) -> str:
+    return ADVERSARY_ENGINE_PROMPT.format(dilemma=dilemma)
+
+
+@lru_cache(maxsize=512)
+def combined_prompt(dilemma: str) -> str:
+    return COMBINED_ENGINE_PROMPT.format(dilemma=dilemma)
+
+
+@lru_cache(maxsize=512)
+def lightweight_prompt(dilemma: str) -> str:
+    return LIGHTWEIGHT_ENGINE_PROMPT.format(dilemma=dilemma)
+
+
+# Not memoized: keyed on generated stances it would practically never hit,
+# and repeated dilemmas are already served by the semantic cache.
+def synthesis_prompt(noble: str, adversary: str) -> str:
+    return SYNTHESIS_PROMPT.format(noble=noble, adversary=adversary)
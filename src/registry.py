@@ -1,45 +1,91 @@
 # src/registry.py
 
-from datetime import datetime
-from typing import Dict, Any, List
-import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Any, Iterable, Iterator, List, Set
+import json
+import os
+import time
+import weakref
 
 
+# ---------- Identifiers ----------
+
+def new_id() -> str:
+    """
+    128 random bits as 32 hex chars: the entropy of uuid4(), without
+    building a UUID object or its dashed string.
+    """
+    return os.urandom(16).hex()
+
+
+# ---------- Timestamps ----------
+
+_ts_cache = (-1, "")  # (epoch second, "YYYY-MM-DDTHH:MM:SS")
+
+
+def utc_timestamp() -> str:
+    """
+    ISO-8601 UTC timestamp with microseconds, same shape as
+    datetime.utcnow().isoformat(). The date/time prefix is formatted
+    at most once per second; only the microseconds change per call.
+    """
+    global _ts_cache
+
+    ns = time.time_ns()
+    sec = ns // 1_000_000_000
+
+    cached_sec, prefix = _ts_cache
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _ts_cache = (sec, prefix)
+
+    return f"{prefix}.{(ns // 1000) % 1_000_000:06d}"
+
+
+@dataclass(frozen=True, slots=True, eq=False)
 class MoralRecord:
     """
     Immutable record of a moral event.
     Once written, it must never be edited or deleted.
     """
 
-    def __init__(
-        self,
-        dilemma_id: str,
-        action_name: str,
-        threshold: str,
-        justification: str,
-        guilt: bool,
-        metadata: Dict[str, Any] | None = None,
-    ):
-        self.record_id = str(uuid.uuid4())
-        self.timestamp = datetime.utcnow().isoformat()
-        self.dilemma_id = dilemma_id
-        self.action_name = action_name
-        self.threshold = threshold  # threat | risk | damage | none
-        self.justification = justification
-        self.guilt = guilt
-        self.metadata = metadata or {}
+    dilemma_id: str
+    action_name: str
+    threshold: str  # threat | risk | damage | none
+    justification: str
+    guilt: bool
+    metadata: Dict[str, Any] | None = None
+    record_id: str = field(default_factory=new_id)
+    timestamp: str = field(default_factory=utc_timestamp)
+    _dict: Dict[str, Any] | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        if not self.metadata:
+            object.__setattr__(self, "metadata", {})
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "record_id": self.record_id,
-            "timestamp": self.timestamp,
-            "dilemma_id": self.dilemma_id,
-            "action": self.action_name,
-            "threshold": self.threshold,
-            "justification": self.justification,
-            "guilt": self.guilt,
-            "metadata": self.metadata,
-        }
+        """
+        A fresh dict per call: callers may edit it without touching the record.
+        """
+        return dict(self._view())
+
+    def _view(self) -> Dict[str, Any]:
+        """
+        Built once and shared: read-only, for serializers inside this module.
+        """
+        if self._dict is None:
+            object.__setattr__(self, "_dict", {
+                "record_id": self.record_id,
+                "timestamp": self.timestamp,
+                "dilemma_id": self.dilemma_id,
+                "action": self.action_name,
+                "threshold": self.threshold,
+                "justification": self.justification,
+                "guilt": self.guilt,
+                "metadata": self.metadata,
+            })
+        return self._dict
 
 
 class Registry:
@@ -50,12 +96,32 @@ class Registry:
 
     def __init__(self):
         self._log: List[MoralRecord] = []
+        # Auxiliary indexes, append-only like the log itself
+        self._by_dilemma: Dict[str, List[MoralRecord]] = defaultdict(list)
+        self._guilt: List[MoralRecord] = []
+        self._guilty_dilemmas: Set[str] = set()
 
     def write(self, record: MoralRecord):
         """
         Append record. No overwrite. No deletion.
         """
         self._log.append(record)
+        self._index(record)
+
+    def write_many(self, records: Iterable[MoralRecord]):
+        """
+        Append a batch in one extend. Same guarantees as write().
+        """
+        records = list(records)
+        self._log.extend(records)
+        for record in records:
+            self._index(record)
+
+    def _index(self, record: MoralRecord):
+        self._by_dilemma[record.dilemma_id].append(record)
+        if record.guilt:
+            self._guilt.append(record)
+            self._guilty_dilemmas.add(record.dilemma_id)
 
     def all(self) -> List[Dict[str, Any]]:
         """
@@ -63,19 +129,193 @@ class Registry:
         """
         return [r.to_dict() for r in self._log]
 
+    def iter_by_dilemma(self, dilemma_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Lazy by_dilemma(): yields each record as the consumer asks for it.
+        """
+        for r in self._by_dilemma.get(dilemma_id, ()):
+            yield r.to_dict()
+
     def by_dilemma(self, dilemma_id: str) -> List[Dict[str, Any]]:
-        return [
-            r.to_dict() for r in self._log if r.dilemma_id == dilemma_id
-        ]
+        return list(self.iter_by_dilemma(dilemma_id))
 
     def guilt_records(self) -> List[Dict[str, Any]]:
         """
         Returns all records where guilt was explicitly acknowledged.
         """
         return [
-            r.to_dict() for r in self._log if r.guilt
+            r.to_dict() for r in self._guilt
         ]
 
+    def has_guilt(self, dilemma_id: str) -> bool:
+        """
+        Whether any record of the dilemma acknowledges guilt. O(1).
+        """
+        return dilemma_id in self._guilty_dilemmas
+
+
+class BufferedRegistry(Registry):
+    """
+    Stages writes and appends them in batches of `batch_size`.
+    Every read flushes first: a buffered record is never missing from an audit.
+    """
+
+    def __init__(self, batch_size: int = 128):
+        super().__init__()
+        self.batch_size = batch_size
+        self._buf: List[MoralRecord] = []
+
+    def write(self, record: MoralRecord):
+        self._buf.append(record)
+        if len(self._buf) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, records: Iterable[MoralRecord]):
+        self.flush()
+        super().write_many(records)
+
+    def flush(self):
+        if self._buf:
+            super().write_many(self._buf)
+            self._buf.clear()
+
+    def all(self) -> List[Dict[str, Any]]:
+        self.flush()
+        return super().all()
+
+    def iter_by_dilemma(self, dilemma_id: str) -> Iterator[Dict[str, Any]]:
+        self.flush()  # now, not on the first next()
+        return super().iter_by_dilemma(dilemma_id)
+
+    def guilt_records(self) -> List[Dict[str, Any]]:
+        self.flush()
+        return super().guilt_records()
+
+    def has_guilt(self, dilemma_id: str) -> bool:
+        self.flush()
+        return super().has_guilt(dilemma_id)
+
+
+class PersistentRegistry(Registry):
+    """
+    Registry mirrored to an append-only JSONL file, one record per line.
+    Records are encoded into a single buffer and reach the file with one
+    os.write per flush: every `batch_size` records (1 = write-through) or
+    once the buffer passes `max_buffer` bytes. With fsync=True each flush
+    is also synced to disk. An existing log is replayed on open.
+
+    Buffered records (batch_size > 1) are in memory only: a crash loses
+    them. close(), garbage collection and interpreter exit flush them.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 1,
+        max_buffer: int = 128 * 1024,
+        fsync: bool = False,
+    ):
+        super().__init__()
+        self.path = path
+        self.batch_size = batch_size
+        self.max_buffer = max_buffer
+        self.fsync = fsync
+        self._buf = bytearray()
+        self._pending = 0
+
+        if os.path.exists(path):
+            self._replay(path)
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        # Holds the fd and buffer, not self: runs on close(), GC or exit
+        self._finalizer = weakref.finalize(self, _flush_and_close, self._fd, self._buf, fsync)
+
+    def write(self, record: MoralRecord):
+        self._check_open()
+        line = _encode(record)  # before touching the log: a bad record is never half-written
+        super().write(record)
+        self._stage(line)
+
+    def write_many(self, records: Iterable[MoralRecord]):
+        self._check_open()
+        records = list(records)
+        lines = [_encode(r) for r in records]
+        super().write_many(records)
+        for line in lines:
+            self._stage(line)
+
+    def _check_open(self):
+        if self._fd < 0:
+            raise ValueError("registry is closed")
+
+    def _stage(self, line: bytes):
+        self._buf += line
+        self._pending += 1
+        if self._pending >= self.batch_size or len(self._buf) >= self.max_buffer:
+            self.flush()
+
+    def flush(self):
+        if not self._buf:
+            return
+
+        _write_buffer(self._fd, self._buf, self.fsync)
+        self._pending = 0
+
+    def close(self):
+        self._finalizer()  # flushes and closes once; later calls are no-ops
+        self._fd = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _replay(self, path: str):
+        records = []
+        intact = 0  # bytes up to the end of the last complete line
+        with open(path, "rb") as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # torn last line from a crash mid-write
+                intact += len(raw)
+                if not raw.strip():
+                    continue
+                d = json.loads(raw)
+                records.append(MoralRecord(
+                    dilemma_id=d["dilemma_id"],
+                    action_name=d["action"],
+                    threshold=d["threshold"],
+                    justification=d["justification"],
+                    guilt=d["guilt"],
+                    metadata=d["metadata"],
+                    record_id=d["record_id"],
+                    timestamp=d["timestamp"],
+                ))
+
+        if intact < os.path.getsize(path):
+            os.truncate(path, intact)  # the next append must start on a fresh line
+        super().write_many(records)
+
+
+def _write_buffer(fd: int, buf: bytearray, fsync: bool):
+    written = 0
+    with memoryview(buf) as view:
+        while written < len(view):
+            written += os.write(fd, view[written:])
+    buf.clear()
+    if fsync:
+        os.fsync(fd)
+
+
+def _flush_and_close(fd: int, buf: bytearray, fsync: bool):
+    if buf:
+        _write_buffer(fd, buf, fsync)
+    os.close(fd)
+
+
+def _encode(record: MoralRecord) -> bytes:
+    return json.dumps(record._view(), ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
 
 # ---------- Canonical helper ----------
 
@@ -85,9 +325,12 @@ def register_decision(
     decision,
     threshold: str,
     metadata: Dict[str, Any] | None = None,
+    batch: List[MoralRecord] | None = None,
 ):
     """
     Single sanctioned entry point.
+    With `batch`, the record is staged there instead of written;
+    the caller commits it later with registry.write_many(batch).
     """
 
     record = MoralRecord(
@@ -99,4 +342,7 @@ def register_decision(
         metadata=metadata,
     )
 
-    registry.write(record)
+    if batch is not None:
+        batch.append(record)
+    else:
+        registry.write(record)
@@ -0,0 +1,138 @@
+# src/semantic_cache.py
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+# Rows upcast per block when the matrix is stored in float16
+_BLOCK_ROWS = 4096
+
+
+class SemanticCache:
+    """
+    Analysis cache keyed by dilemma embedding.
+    A lookup hits when the nearest stored dilemma has cosine similarity
+    >= threshold. Entries expire after `ttl` seconds.
+
+    dtype=np.float16 halves the matrix's memory for very large caches.
+    NumPy has no BLAS kernel for float16, so lookups then upcast in blocks
+    and are slower: it trades speed for RAM, and float32 is the default.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        ttl: float = 3600.0,
+        capacity: int = 64,
+        dtype=np.float32,
+    ):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.dtype = np.dtype(dtype)
+        self._matrix: Optional[np.ndarray] = None  # (capacity, dim), filas normalizadas
+        self._timestamps = np.empty(capacity, dtype=np.float64)
+        self._entries: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ---------- Lookup ----------
+
+    def get(self, embedding: Sequence[float]) -> Optional[Dict[str, Any]]:
+        query = _normalize(embedding)
+        if query is None:
+            return None
+
+        with self._lock:
+            size = len(self._entries)
+            if size == 0 or self._matrix.shape[1] != query.shape[0]:
+                self.misses += 1
+                return None
+
+            sims = self._similarities(query, size)
+            best = int(np.argmax(sims))
+
+            fresh = time.monotonic() - self._timestamps[best] <= self.ttl
+            if sims[best] >= self.threshold and fresh:
+                self.hits += 1
+                return self._entries[best]
+
+            self.misses += 1
+            return None
+
+    # ---------- Insert ----------
+
+    def put(self, embedding: Sequence[float], entry: Dict[str, Any]):
+        row = _normalize(embedding)
+        if row is None:
+            return
+
+        with self._lock:
+            self._evict_expired()
+
+            size = len(self._entries)
+            if self._matrix is None or self._matrix.shape[1] != row.shape[0]:
+                self._matrix = np.empty((len(self._timestamps), row.shape[0]), dtype=self.dtype)
+                self._entries.clear()
+                size = 0
+            elif size == len(self._matrix):
+                self._grow()
+
+            self._matrix[size] = row
+            self._timestamps[size] = time.monotonic()
+            self._entries.append(entry)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    # ---------- Internals ----------
+
+    def _similarities(self, query: np.ndarray, size: int) -> np.ndarray:
+        if self._matrix.dtype == np.float32:
+            return self._matrix[:size] @ query
+
+        sims = np.empty(size, dtype=np.float32)
+        for start in range(0, size, _BLOCK_ROWS):
+            stop = min(start + _BLOCK_ROWS, size)
+            sims[start:stop] = self._matrix[start:stop].astype(np.float32) @ query
+        return sims
+
+    def _grow(self):
+        capacity = 2 * len(self._matrix)
+        matrix = np.empty((capacity, self._matrix.shape[1]), dtype=self._matrix.dtype)
+        matrix[: len(self._matrix)] = self._matrix
+        timestamps = np.empty(capacity, dtype=np.float64)
+        timestamps[: len(self._timestamps)] = self._timestamps
+        self._matrix = matrix
+        self._timestamps = timestamps
+
+    def _evict_expired(self):
+        size = len(self._entries)
+        if size == 0:
+            return
+
+        keep = time.monotonic() - self._timestamps[:size] <= self.ttl
+        if keep.all():
+            return
+
+        kept = np.flatnonzero(keep)
+        self._matrix[: len(kept)] = self._matrix[kept]
+        self._timestamps[: len(kept)] = self._timestamps[kept]
+        self._entries = [self._entries[i] for i in kept]
+
+
+def _normalize(embedding: Sequence[float]) -> Optional[np.ndarray]:
+    vec = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vec)
+    if vec.ndim != 1 or norm == 0.0:
+        return None
+    return vec / norm
@@ -4,15 +4,25 @@ from enum import Enum
 from dataclasses import dataclass
 from typing import Dict, Any
 
+import numpy as np
+
+from _jit import HAVE_NUMBA, warn_fallback
+
 
 class Threshold(str, Enum):
-    NONE = "none"
-    RISK = "risk"
-    THREAT = "threat"
-    DAMAGE = "damage"
+    NONE = ("none", 0)
+    RISK = ("risk", 1)
+    THREAT = ("threat", 2)
+    DAMAGE = ("damage", 3)
+
+    def __new__(cls, value: str, code: int):
+        member = str.__new__(cls, value)
+        member._value_ = value
+        member.code = code  # índice en las tablas *_BY_CODE
+        return member
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ThresholdAssessment:
     threshold: Threshold
     agency_loss: float          # 0.0 – 1.0 (daño = disminución de agencia)
@@ -39,61 +49,108 @@ def assess_entropy_delta(context: Dict[str, Any]) -> float:
     return float(context.get("entropy_delta", 0.0))
 
 
-def classify_threshold(context: Dict[str, Any]) -> ThresholdAssessment:
-    agency_loss = assess_agency_loss(context)
-    entropy_delta = assess_entropy_delta(context)
+# Threshold codes: index into the *_BY_CODE tables
+_NONE = Threshold.NONE.code
+_RISK = Threshold.RISK.code
+_THREAT = Threshold.THREAT.code
+_DAMAGE = Threshold.DAMAGE.code
 
-    if context.get("imminent_threat", False):
-        return ThresholdAssessment(
-            threshold=Threshold.THREAT,
-            agency_loss=agency_loss,
-            entropy_delta=entropy_delta,
-            justification="Imminent threat detected; immediate neutralization required.",
-            metadata=context,
-        )
+_THRESHOLD_BY_CODE = (Threshold.NONE, Threshold.RISK, Threshold.THREAT, Threshold.DAMAGE)
+
+_JUSTIFICATION_BY_CODE = (
+    "No actionable threshold crossed.",
+    "Significant risk detected; early intervention justified.",
+    "Imminent threat detected; immediate neutralization required.",
+    "Agency already diminished; restoration and prevention required.",
+)
+
+
+def _classify_core(agency_loss: float, entropy_delta: float, imminent: bool) -> int:
+    """
+    Pure numeric decision. Order matters: threat > damage > risk > none.
+    """
+    if imminent:
+        return _THREAT
 
     if agency_loss >= 0.6:
-        return ThresholdAssessment(
-            threshold=Threshold.DAMAGE,
-            agency_loss=agency_loss,
-            entropy_delta=entropy_delta,
-            justification="Agency already diminished; restoration and prevention required.",
-            metadata=context,
-        )
+        return _DAMAGE
 
     if agency_loss >= 0.2 or entropy_delta > 0.3:
-        return ThresholdAssessment(
-            threshold=Threshold.RISK,
-            agency_loss=agency_loss,
-            entropy_delta=entropy_delta,
-            justification="Significant risk detected; early intervention justified.",
-            metadata=context,
-        )
+        return _RISK
+
+    return _NONE
+
+
+def classify_threshold(context: Dict[str, Any]) -> ThresholdAssessment:
+    agency_loss = assess_agency_loss(context)
+    entropy_delta = assess_entropy_delta(context)
+
+    code = _classify_core(agency_loss, entropy_delta, context.get("imminent_threat", False))
 
     return ThresholdAssessment(
-        threshold=Threshold.NONE,
+        threshold=_THRESHOLD_BY_CODE[code],
         agency_loss=agency_loss,
         entropy_delta=entropy_delta,
-        justification="No actionable threshold crossed.",
+        justification=_JUSTIFICATION_BY_CODE[code],
         metadata=context,
     )
 
 
-# ------------------ Acciones canónicas ------------------
+# ------------------ Clasificación por lotes ------------------
+# Single classifications stay in plain Python: one call does not amortize
+# JIT dispatch, let alone compilation. Batches go through the native kernel
+# (_threshold_kernels, loaded on first use), or through whole-array NumPy
+# masks when numba is not installed.
 
-def action_for_threshold(assessment: ThresholdAssessment) -> str:
+def _classify_batch_numpy(agency_loss, entropy_delta, imminent, out):
+    # Later assignments win, so they go in increasing priority
+    out.fill(_NONE)
+    out[(agency_loss >= 0.2) | (entropy_delta > 0.3)] = _RISK
+    out[agency_loss >= 0.6] = _DAMAGE
+    out[imminent] = _THREAT
+
+
+def classify_threshold_batch(agency_loss, entropy_delta, imminent) -> np.ndarray:
     """
-    Maps threshold to mandatory action class.
-    No moral optimization here.
+    Threshold codes for N contexts at once (0=NONE, 1=RISK, 2=THREAT, 3=DAMAGE).
+    Same decision as classify_threshold; clamping agency_loss to [0, 1]
+    cannot change it, so it is skipped.
     """
+    agency_loss = np.ascontiguousarray(agency_loss, dtype=np.float64)
+    entropy_delta = np.ascontiguousarray(entropy_delta, dtype=np.float64)
+    imminent = np.ascontiguousarray(imminent, dtype=np.bool_)
+
+    # The native kernel has no bounds checks: mismatched inputs must not reach it
+    if agency_loss.ndim != 1 or not (agency_loss.shape == entropy_delta.shape == imminent.shape):
+        raise ValueError(
+            "classify_threshold_batch expects 1-D arrays of equal length, got shapes "
+            f"{agency_loss.shape}, {entropy_delta.shape}, {imminent.shape}"
+        )
 
-    if assessment.threshold == Threshold.THREAT:
-        return "NEUTRALIZE_IMMEDIATELY"
+    out = np.empty(agency_loss.shape[0], dtype=np.int8)
+    if HAVE_NUMBA:
+        from _threshold_kernels import classify_batch_kernel  # first call loads numba
 
-    if assessment.threshold == Threshold.RISK:
-        return "INTERVENE_FIRST"
+        classify_batch_kernel(agency_loss, entropy_delta, imminent, out)
+    else:
+        warn_fallback("classify_threshold_batch", "NumPy")
+        _classify_batch_numpy(agency_loss, entropy_delta, imminent, out)
+    return out
 
-    if assessment.threshold == Threshold.DAMAGE:
-        return "RESTORE_PUNISH_REPUDIATE_PREVENT"
 
-    return "NO_ACTION"
+# ------------------ Acciones canónicas ------------------
+
+_ACTION_BY_CODE = (
+    "NO_ACTION",
+    "INTERVENE_FIRST",
+    "NEUTRALIZE_IMMEDIATELY",
+    "RESTORE_PUNISH_REPUDIATE_PREVENT",
+)
+
+
+def action_for_threshold(assessment: ThresholdAssessment) -> str:
+    """
+    Maps threshold to mandatory action class.
+    No moral optimization here.
+    """
+    return _ACTION_BY_CODE[assessment.threshold.code]
@@ -1,8 +1,23 @@
+import mmap
+import os
 import streamlit as st
-from pathlib import Path
 
 st.set_page_config(layout="wide")
 
-html = Path("ui/index.html").read_text(encoding="utf-8")
+HTML_PATH = "ui/index.html"
+
+
+@st.cache_data
+def _load_ui_html(path: str, mtime: float) -> str:
+    # mtime forma parte de la clave: editar el archivo invalida la caché
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        # Decoded straight from the page cache, no intermediate read buffer
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return str(mm, "utf-8")
+
+
+html = _load_ui_html(HTML_PATH, os.path.getmtime(HTML_PATH))
 
 st.components.v1.html(html, height=900, scrolling=True)